@@ -4,10 +4,16 @@ Image Shortlisting Tool
 Python 3.12 compatible
 """
 
+import os
 import sys
 import json
+import errno
+import queue
 import shutil
+import hashlib
 import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List
 
@@ -15,16 +21,78 @@ import pygame
 from PIL import Image, ImageOps
 
 STATE_FILE = "shortlist_state.json"
+STATE_SAVE_DELAY = 0.5  # seconds
+PRELOAD_RADIUS = 2  # images kept ready on each side of the current one
+COUNTER_CACHE_SIZE = 64
+EVENT_WAIT_TIMEOUT_MS = 100
+READAHEAD_COUNT = 4  # files past the preload window to prefetch
+PRELOAD_READY_EVENT = pygame.USEREVENT
 SUPPORTED_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+_IMAGE_SUFFIXES = tuple(SUPPORTED_EXTENSIONS)
 WINDOW_BG_COLOR = (30, 30, 30)
-
-
-def scan_images(root_dir: Path) -> List[Path]:
-    images = []
-    for path in sorted(root_dir.rglob("*")):
-        if path.suffix.lower() in SUPPORTED_EXTENSIONS:
-            images.append(path)
-    return images
+# Modes PIL resizes with the requested filter
+RESIZABLE_MODES = {"RGB", "RGBA", "RGBX", "L", "LA", "CMYK"}
+RESIZE_REDUCING_GAP = 3.0
+
+# Screen-sized thumbnails, keyed by path + mtime + screen size
+CACHE_DIR = Path(".cache")
+CACHE_DIR_LIMIT_BYTES = 1024 ** 3  # oldest thumbnails are pruned past 1 GiB
+SURFACE_CACHE_SIZE = 16
+
+# Converted surfaces; only touched from the main thread
+_surface_cache: OrderedDict = OrderedDict()
+
+# Long-lived workers instead of a new thread per key press. The main
+# thread only schedules and converts; libjpeg/libpng decoding, PIL resizes
+# and file copies all release the GIL, so the pool gets one worker per
+# preload neighbour (as far as the cores allow) without starving input.
+_pool = ThreadPoolExecutor(
+    max_workers=max(1, min(2 * PRELOAD_RADIUS, os.cpu_count() or 1)),
+    thread_name_prefix="preload",
+)
+_io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="copy")
+_readahead_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="readahead")
+# Thumbnail encodes and pruning; kept off _io_pool so picks never queue behind them
+_thumbnail_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnail")
+
+# posix_fadvise is Linux/BSD only; elsewhere readahead is skipped
+CAN_READAHEAD = hasattr(os, "posix_fadvise")
+
+# copy_file_range failures that mean "use a regular copy instead"
+_COPY_FALLBACK_ERRNOS = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP}
+
+# Debounced state saving, see schedule_save_state()
+_pending_state: dict | None = None
+_state_timer: threading.Timer | None = None
+_state_lock = threading.Lock()
+_state_write_lock = threading.Lock()
+
+
+def scan_images(root_dir: Path) -> List[str]:
+    image_paths = []
+    pending_dirs = deque([os.fspath(root_dir)])
+
+    # Iterative walk: only matching file names ever become strings we keep,
+    # and DirEntry answers is_dir() without an extra stat()
+    while pending_dirs:
+        try:
+            with os.scandir(pending_dirs.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending_dirs.append(entry.path)
+                    # One lower() plus one C-level endswith over the tuple;
+                    # non-images exit after that single test
+                    elif entry.name.lower().endswith(_IMAGE_SUFFIXES):
+                        image_paths.append(entry.path)
+        except OSError:
+            # Unreadable, vanished or not a directory: skip it, like rglob
+            continue
+
+    # Sort by path components like Path does (case-folded on Windows), so
+    # saved resume indices stay valid.
+    # Plain str paths: no Path object per image. Only copying needs one.
+    image_paths.sort(key=lambda path: os.path.normcase(path).split(os.sep))
+    return image_paths
 
 
 def load_state() -> dict | None:
@@ -35,80 +103,442 @@ def load_state() -> dict | None:
 
 
 def save_state(state: dict) -> None:
-    with open(STATE_FILE, "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=2)
+    # Write-then-rename so a crash mid-write never leaves a truncated file
+    tmp_path = f"{STATE_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, separators=(",", ":"))
+    os.replace(tmp_path, STATE_FILE)
+
+
+def schedule_save_state(state: dict) -> None:
+    """Save state off the main thread, at most once per STATE_SAVE_DELAY."""
+    global _pending_state, _state_timer
+
+    with _state_lock:
+        _pending_state = state
+        if _state_timer is None:
+            _state_timer = threading.Timer(STATE_SAVE_DELAY, flush_state)
+            _state_timer.daemon = True
+            _state_timer.start()
+
+
+def flush_state() -> None:
+    global _pending_state, _state_timer
+
+    with _state_write_lock:
+        with _state_lock:
+            state = _pending_state
+            _pending_state = None
+            if _state_timer is not None:
+                _state_timer.cancel()
+                _state_timer = None
+
+        if state is not None:
+            save_state(state)
+
+
+def copy_file_range(src: Path, dst: Path) -> bool:
+    """Copy src to dst in-kernel. Returns False if the caller should fall back."""
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        first_call = True
+        while remaining > 0:
+            try:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+            except OSError as error:
+                # Old kernel, cross-filesystem or unsupported filesystem
+                if first_call and error.errno in _COPY_FALLBACK_ERRNOS:
+                    return False
+                raise
+
+            if copied == 0:
+                # Some filesystems report 0 instead of an error
+                if first_call:
+                    return False
+                raise OSError(errno.EIO, f"copy_file_range stopped early: {src}")
+
+            remaining -= copied
+            first_call = False
+
+    return True
+
+
+def copy_file(src: Path, dst: Path) -> None:
+    """shutil.copy2, but copied in-kernel with copy_file_range where possible.
+
+    On btrfs/XFS that is a reflink; elsewhere it still avoids shuttling
+    the bytes through userspace.
+    """
+    if hasattr(os, "copy_file_range"):
+        # Opening dst for writing would truncate src if they are one file
+        if dst.exists() and os.path.samefile(src, dst):
+            raise shutil.SameFileError(f"{src} and {dst} are the same file")
+
+        if copy_file_range(src, dst):
+            shutil.copystat(src, dst)
+            return
+
+    shutil.copy2(src, dst)
+
+
+def advise_readahead(image_path: str) -> None:
+    """Ask the kernel to pull a file into the page cache ahead of decoding."""
+    try:
+        fd = os.open(image_path, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
 
 
 def copy_image_async(src: Path, dst_dir: Path) -> None:
     def worker():
-        dst_dir.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src, dst_dir / src.name)
+        try:
+            dst_dir.mkdir(parents=True, exist_ok=True)
+            copy_file(src, dst_dir / src.name)
+        except OSError as error:
+            print(f"❌ Failed to copy {src}: {error}")
+
+    _io_pool.submit(worker)
+
+
+def fit_size(size, screen_size):
+    """Largest size with the same aspect ratio that fits the screen (never upscales)."""
+    w, h = size
+    sw, sh = screen_size
+    ratio = min(sw / w, sh / h, 1.0)
+    return max(1, round(w * ratio)), max(1, round(h * ratio))
+
+
+def fit_image_to_screen(image: Image.Image, screen_size, resample) -> Image.Image:
+    target = fit_size(image.size, screen_size)
+    if target == image.size:
+        return image
+    # reducing_gap lets PIL box-reduce by an integer factor first, so the
+    # filter only runs over the last <= 3x of the downscale
+    return image.resize(target, resample, reducing_gap=RESIZE_REDUCING_GAP)
+
+
+def thumbnail_cache_path(image_path: str, mtime: int, screen_size, suffix: str) -> Path:
+    w, h = screen_size
+    key = hashlib.sha1(f"{image_path}|{mtime}|{w}x{h}".encode()).hexdigest()
+    return CACHE_DIR / f"{key}{suffix}"
+
+
+def prune_thumbnail_cache() -> None:
+    """Delete the least recently used thumbnails until CACHE_DIR fits its limit."""
+    entries = []
+    try:
+        with os.scandir(CACHE_DIR) as cache_entries:
+            for entry in cache_entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return
+
+    total = sum(size for _, size, _ in entries)
+    # Cache hits touch their file, so mtime order is use order
+    for _, size, path in sorted(entries):
+        if total <= CACHE_DIR_LIMIT_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def save_thumbnail(image, cache_path: Path) -> None:
+    """Store a screen-sized PIL image or pygame surface in the thumbnail cache."""
+    # Write to a temp file first so a concurrent reader never sees half a
+    # file. Keeping the real suffix tells pygame which format to write.
+    tmp_path = cache_path.with_name(
+        f"{cache_path.stem}.{threading.get_ident()}.tmp{cache_path.suffix}"
+    )
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        if isinstance(image, pygame.Surface):
+            pygame.image.save(image, str(tmp_path))
+        else:
+            image.save(tmp_path, "JPEG", quality=90)
+        os.replace(tmp_path, cache_path)
+    except (OSError, pygame.error):
+        tmp_path.unlink(missing_ok=True)
 
-    threading.Thread(target=worker, daemon=True).start()
 
+def decode_image(image_path: str, screen_size):
+    """Decode and fit an image with PIL.
 
-def load_surface(image_path: Path, screen_size):
+    Returns the RGB image and whether it was scaled (worth caching).
+    """
     with Image.open(image_path) as img:
+        original_size = img.size
+
+        # Let libjpeg decode at 1/2, 1/4 or 1/8 scale straight away
+        # (no-op for PNG). Result is still >= screen_size.
+        img.draft("RGB", screen_size)
+
         img = ImageOps.exif_transpose(img)
-        img = img.convert("RGB")
-        img.thumbnail(screen_size, Image.LANCZOS)
 
-        surface = pygame.image.fromstring(
-            img.tobytes(), img.size, img.mode
-        ).convert()
+        # Palette/bilevel images would be resized with NEAREST, so those
+        # get converted up front; everything else converts after the
+        # resize, on the small image
+        if img.mode not in RESIZABLE_MODES:
+            img = img.convert("RGB")
+
+        # draft() already supersampled JPEGs, BICUBIC is enough. PNGs never
+        # get here (see read_png_surface), so LANCZOS would only ever apply
+        # to non-JPEG data in a .jpg file.
+        img = fit_image_to_screen(img, screen_size, Image.BICUBIC)
+        # EXIF rotation alone may swap width and height
+        scaled = img.size not in (original_size, original_size[::-1])
+        return img.convert("RGB"), scaled
+
+
+def read_png_surface(image_path: str, screen_size):
+    """PNGs bypass PIL: SDL_image decodes and smoothscale downsizes, both in C.
+
+    Returns the surface and whether it was scaled (worth caching).
+    """
+    raw = pygame.image.load(image_path)
+    target = fit_size(raw.get_size(), screen_size)
+    if target == raw.get_size():
+        return raw, False
 
+    # smoothscale only handles 24/32-bit surfaces (not palette PNGs)
+    if raw.get_bitsize() not in (24, 32):
+        raw = raw.convert(24)
+
+    return pygame.transform.smoothscale(raw, target), True
+
+
+def read_surface(image_path: str, mtime: int, screen_size):
+    """Decode a screen-sized surface in the source pixel format.
+
+    Safe to call from worker threads: the caller does convert() on the
+    main thread, where the display format is known.
+    """
+    # PNGs (screenshots, line art) are cached losslessly so a revisit
+    # shows exactly what the first view did
+    is_png = image_path.lower().endswith(".png")
+    cache_path = thumbnail_cache_path(
+        image_path, mtime, screen_size, ".png" if is_png else ".jpg"
+    )
+
+    if cache_path.exists():
+        try:
+            surface = pygame.image.load(str(cache_path))
+            os.utime(cache_path)  # mark as recently used for pruning
+            return surface
+        except (pygame.error, OSError):
+            pass
+
+    if is_png:
+        surface, scaled = read_png_surface(image_path, screen_size)
+        # Screen-sized PNGs load as fast as their cached copy would
+        if scaled:
+            # Encoding takes tens of ms at 4K, so it runs on the thumbnail
+            # worker. It gets its own copy since the caller converts this one.
+            _thumbnail_pool.submit(save_thumbnail, surface.copy(), cache_path)
+        return surface
+
+    # JPEGs stay on PIL for draft() and EXIF orientation
+    img, scaled = decode_image(image_path, screen_size)
+    # Same as PNGs: a JPEG that already fits gains nothing from a
+    # recompressed copy
+    if scaled:
+        _thumbnail_pool.submit(save_thumbnail, img, cache_path)
+
+    # frombuffer wraps the bytes without copying (the surface keeps them
+    # alive); the later convert() makes the only copy
+    return pygame.image.frombuffer(img.tobytes(), img.size, "RGB")
+
+
+def surface_cache_key(image_path: str, screen_size) -> tuple:
+    return (image_path, os.stat(image_path).st_mtime_ns, *screen_size)
+
+
+def get_cached_surface(key: tuple):
+    surface = _surface_cache.get(key)
+    if surface is not None:
+        _surface_cache.move_to_end(key)
     return surface
 
 
-def run_viewer(images_root: Path, images: List[Path], output_dir: Path, start_index: int):
+def cache_surface(key: tuple, surface) -> None:
+    _surface_cache[key] = surface
+    _surface_cache.move_to_end(key)
+    while len(_surface_cache) > SURFACE_CACHE_SIZE:
+        _surface_cache.popitem(last=False)
+
+
+def load_surface(image_path: str, screen_size):
+    """Main thread only: returns a display-format surface."""
+    key = surface_cache_key(image_path, screen_size)
+
+    surface = get_cached_surface(key)
+    if surface is None:
+        surface = read_surface(image_path, key[1], screen_size).convert()
+        cache_surface(key, surface)
+
+    return surface
+
+
+def run_viewer(images_root: Path, images: List[str], output_dir: Path, start_index: int):
     pygame.init()
     pygame.display.set_caption("Image Picker")
 
     screen = pygame.display.set_mode((0, 0), pygame.RESIZABLE)
-    clock = pygame.time.Clock()
+    # Refreshed on VIDEORESIZE only, not queried every frame
+    screen_size = screen.get_size()
+    screen_center = screen.get_rect().center
+    # Keep the display awake while images are being reviewed
+    pygame.display.set_allow_screensaver(False)
+    _thumbnail_pool.submit(prune_thumbnail_cache)
 
     index = start_index
+    direction = 1  # last navigation step, steers readahead
     needs_redraw = True
 
     current_surface = None
-    next_surface = None
-    next_index = None
-    prev_surface = None
-    prev_index = None
+    # Converted surfaces for index - PRELOAD_RADIUS .. index + PRELOAD_RADIUS
+    window_surfaces = {}
+    preload_futures = {}
+    ready_surfaces = queue.SimpleQueue()
+
+    # Built once; only current_index changes while viewing
+    state_template = {
+        "images_root": str(images_root),
+        "output_dir": str(output_dir),
+        "current_index": start_index,
+        "total_images": len(images)
+    }
 
     # Font for image counter overlay
     font_size = 36  # visible but not intrusive
     counter_font = pygame.font.SysFont("DejaVu Sans", font_size, bold=True)
+    counter_texts = OrderedDict()  # (index + 1, total) -> rendered text, LRU
+    counter_backgrounds = {}       # size -> translucent backing surface
 
-    def preload_surface(target_index):
-        nonlocal next_surface, next_index, prev_surface, prev_index
-
-        snapshot_index = index
+    def in_window(target_index):
+        return abs(target_index - index) <= PRELOAD_RADIUS
 
-        if target_index < 0 or target_index >= len(images):
+    def preload_surface(target_index, screen_size):
+        # Worker thread: decode only, convert() happens in collect_preloads
+        try:
+            image_path = images[target_index]
+            key = surface_cache_key(image_path, screen_size)
+            raw_surface = read_surface(image_path, key[1], screen_size)
+        except Exception:
             return
 
-        try:
-            surface = load_surface(images[target_index], screen.get_size())
+        ready_surfaces.put((target_index, key, raw_surface))
+        # Wake the main loop out of event.wait() to convert it
+        pygame.event.post(pygame.event.Event(PRELOAD_READY_EVENT))
 
-            # Drop stale preload
-            if snapshot_index != index:
+    def collect_preloads():
+        while True:
+            try:
+                target_index, key, raw_surface = ready_surfaces.get_nowait()
+            except queue.Empty:
                 return
 
-            if target_index == index + 1:
-                next_surface = surface
-                next_index = target_index
-
-            elif target_index == index - 1:
-                prev_surface = surface
-                prev_index = target_index
-
-        except Exception:
-            pass
+            # Rendered for an old window size
+            if key[2:] != screen_size:
+                continue
+
+            surface = raw_surface.convert()
+            cache_surface(key, surface)
+
+            # Stale preloads stay in the LRU but not in the window
+            if in_window(target_index):
+                window_surfaces[target_index] = surface
+
+    def update_window():
+        for window_index in list(window_surfaces):
+            if not in_window(window_index):
+                del window_surfaces[window_index]
+
+        # Queued preloads that left the window are cancelled (running ones
+        # cannot be, and get dropped in collect_preloads). Finished ones are
+        # kept until collected, and failed ones so they are not retried.
+        for queued_index, future in list(preload_futures.items()):
+            if not in_window(queued_index) or queued_index in window_surfaces:
+                future.cancel()
+                del preload_futures[queued_index]
+
+        first = max(0, index - PRELOAD_RADIUS)
+        last = min(len(images) - 1, index + PRELOAD_RADIUS)
+        # Nearest first, forward before backward
+        for target_index in sorted(
+            range(first, last + 1),
+            key=lambda i: (abs(i - index), i < index)
+        ):
+            if target_index in window_surfaces or target_index in preload_futures:
+                continue
+
+            try:
+                cached = get_cached_surface(
+                    surface_cache_key(images[target_index], screen_size)
+                )
+            except OSError:
+                cached = None  # let the worker report nothing for it
+
+            if cached is not None:
+                window_surfaces[target_index] = cached
+                continue
+
+            preload_futures[target_index] = _pool.submit(
+                preload_surface, target_index, screen_size
+            )
+
+        # Warm the page cache for the files just past the window, in the
+        # direction of travel, so their decode later reads from memory
+        if CAN_READAHEAD:
+            start = index + direction * (PRELOAD_RADIUS + 1)
+            for step in range(READAHEAD_COUNT):
+                target_index = start + direction * step
+                if 0 <= target_index < len(images):
+                    _readahead_pool.submit(advise_readahead, images[target_index])
+
+    def show_current():
+        nonlocal current_surface
+
+        # Promote preloaded image if available
+        collect_preloads()
+        current_surface = window_surfaces.get(index)
+        if current_surface is None:
+            current_surface = load_surface(images[index], screen_size)
+            window_surfaces[index] = current_surface
+
+        update_window()
+
+    def quit_viewer():
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _readahead_pool.shutdown(wait=False, cancel_futures=True)
+        _thumbnail_pool.shutdown(wait=False, cancel_futures=True)
+        flush_state()
+        pygame.quit()
+        sys.exit(0)
 
     def draw_image_counter(surface, index, total):
-        text = f"{index + 1} / {total}"
-        text_surface = counter_font.render(text, True, (255, 255, 255))
+        # Rendering text is a freetype call; reuse it for revisits
+        key = (index + 1, total)
+        text_surface = counter_texts.get(key)
+        if text_surface is not None:
+            counter_texts.move_to_end(key)
+        else:
+            text = f"{index + 1} / {total}"
+            text_surface = counter_font.render(text, True, (255, 255, 255))
+            counter_texts[key] = text_surface
+            if len(counter_texts) > COUNTER_CACHE_SIZE:
+                counter_texts.popitem(last=False)
 
         padding = 12
         bg_rect = text_surface.get_rect()
@@ -117,12 +547,14 @@ def run_viewer(images_root: Path, images: List[Path], output_dir: Path, start_in
             padding
         )
 
-        # Semi-transparent background for readability
-        overlay_bg = pygame.Surface(
-            (bg_rect.width + 16, bg_rect.height + 10),
-            pygame.SRCALPHA
-        )
-        overlay_bg.fill((0, 0, 0, 140))  # black with transparency
+        # Semi-transparent background for readability. Its size only
+        # changes with the digit count, so one surface per size is enough.
+        bg_size = (bg_rect.width + 16, bg_rect.height + 10)
+        overlay_bg = counter_backgrounds.get(bg_size)
+        if overlay_bg is None:
+            overlay_bg = pygame.Surface(bg_size, pygame.SRCALPHA)
+            overlay_bg.fill((0, 0, 0, 140))  # black with transparency
+            counter_backgrounds[bg_size] = overlay_bg
 
         surface.blit(
             overlay_bg,
@@ -132,117 +564,91 @@ def run_viewer(images_root: Path, images: List[Path], output_dir: Path, start_in
 
 
     while True:
-        if needs_redraw:
-            screen.fill(WINDOW_BG_COLOR)
+        collect_preloads()
 
-            # Use preloaded image if available
+        if needs_redraw:
             if current_surface is None:
-                current_surface = load_surface(images[index], screen.get_size())
-
-                # Preload neighbors once
-                if index + 1 < len(images):
-                    threading.Thread(
-                        target=preload_surface,
-                        args=(index + 1,),
-                        daemon=True
-                    ).start()
-
-                if index - 1 >= 0:
-                    threading.Thread(
-                        target=preload_surface,
-                        args=(index - 1,),
-                        daemon=True
-                    ).start()
-
-            rect = current_surface.get_rect(center=screen.get_rect().center)
+                show_current()
+
+            rect = current_surface.get_rect(center=screen_center)
+
+            # The image covers its own rect, so only the letterbox bars
+            # around it need the background colour
+            screen_w, screen_h = screen_size
+            dirty_rects = [
+                bar for bar in (
+                    pygame.Rect(0, 0, screen_w, rect.top),
+                    pygame.Rect(0, rect.bottom, screen_w, screen_h - rect.bottom),
+                    pygame.Rect(0, rect.top, rect.left, rect.height),
+                    pygame.Rect(rect.right, rect.top, screen_w - rect.right, rect.height),
+                )
+                if bar.width > 0 and bar.height > 0
+            ]
+            for bar in dirty_rects:
+                screen.fill(WINDOW_BG_COLOR, bar)
+
             screen.blit(current_surface, rect)
             draw_image_counter(screen, index, len(images))
-            pygame.display.flip()
+
+            dirty_rects.append(rect)
+            pygame.display.update(dirty_rects)
 
             needs_redraw = False
 
-        for event in pygame.event.get():
+        # Sleep until input arrives or a preload is ready, rather than
+        # spinning at 60Hz while nothing happens
+        events = [pygame.event.wait(EVENT_WAIT_TIMEOUT_MS)]
+        events.extend(pygame.event.get())
+        resized = False
+
+        for event in events:
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit(0)
+                quit_viewer()
+
+            if event.type == pygame.VIDEORESIZE:
+                # Dragging an edge sends a burst of these; only the size
+                # after the whole batch matters, handled below
+                screen_size = screen.get_size()
+                screen_center = screen.get_rect().center
+                resized = True
 
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE or event.key == pygame.K_q:
-                    pygame.quit()
-                    sys.exit(0)
+                    quit_viewer()
 
                 elif event.key == pygame.K_RIGHT:
                     if index < len(images) - 1:
                         index += 1
+                        direction = 1
 
-                        # SHIFT WINDOW
-                        prev_surface = current_surface
-                        prev_index = index - 1
-
-                        # Promote preloaded image if it matches
-                        if next_surface is not None and next_index == index:
-                            current_surface = next_surface
-                        else:
-                            current_surface = load_surface(images[index], screen.get_size())
-
-                        # Clear old preload
-                        next_surface = None
-                        next_index = None
-
-                        # PRELOAD NEW NEXT
-                        if index + 1 < len(images):
-                            threading.Thread(
-                                target=preload_surface,
-                                args=(index + 1,),
-                                daemon=True
-                            ).start()
-
+                        show_current()
                         needs_redraw = True
-                        save_state({
-                            "images_root": str(images_root),
-                            "output_dir": str(output_dir),
-                            "current_index": index,
-                            "total_images": len(images)
-                        })
+                        schedule_save_state(dict(state_template, current_index=index))
 
                 elif event.key == pygame.K_LEFT:
                     if index > 0:
                         index -= 1
+                        direction = -1
 
-                        # SHIFT WINDOW
-                        next_surface = current_surface
-                        next_index = index + 1
-
-                        if prev_surface is not None and prev_index == index:
-                            current_surface = prev_surface
-                        else:
-                            current_surface = load_surface(images[index], screen.get_size())
-
-                        prev_surface = None
-                        prev_index = None
-
-                        # PRELOAD NEW PREVIOUS
-                        if index - 1 >= 0:
-                            threading.Thread(
-                                target=preload_surface,
-                                args=(index - 1,),
-                                daemon=True
-                            ).start()
-
+                        show_current()
                         needs_redraw = True
-                        save_state({
-                            "images_root": str(images_root),
-                            "output_dir": str(output_dir),
-                            "current_index": index,
-                            "total_images": len(images)
-                        })
+                        schedule_save_state(dict(state_template, current_index=index))
 
                 elif event.key == pygame.K_RETURN:
                     img_path = images[index]
                     print("Picking image:",img_path)
-                    copy_image_async(img_path, output_dir)
-
-        clock.tick(60)
+                    copy_image_async(Path(img_path), output_dir)
+
+        if resized:
+            # Everything loaded so far was fitted to the old size
+            for future in preload_futures.values():
+                future.cancel()
+            preload_futures.clear()
+            window_surfaces.clear()
+            current_surface = None
+            needs_redraw = True
+            # The new size writes a whole new set of thumbnails
+            _thumbnail_pool.submit(prune_thumbnail_cache)
 
 
 def prompt_new_operation():